@@ -1,9 +1,20 @@
+import shutil
+import tempfile
 import streamlit as st
 from crewai import Task, Crew
 from agents import get_problem_generator, get_code_evaluator, get_solution_explainer, get_feedback_reporter
-from tasks import create_problem_prompt, create_evaluation_prompt, create_explanation_prompt, create_feedback_report_prompt
+from tasks import create_problem_prompt, create_stress_harness_prompt, parse_stress_harness, create_evaluation_prompt, create_explanation_prompt, create_feedback_report_prompt
 from history import init_history, add_history_item, get_history
-from code_runner import check_code_syntax, execute_code
+from code_runner import check_code_syntax, execute_code, compile_program, stress_test, run_test_cases
+from dedup import ProblemIndex, problem_title
+from problem_record import build_problem_record, attach_reference, release_record, time_limit
+
+# How many times a near-duplicate problem is regenerated before it is shown anyway
+MAX_REGENERATIONS = 3
+
+# Keep the stress test on the submit path short: at most this many cases or seconds
+STRESS_TEST_CASES = 200
+STRESS_TEST_BUDGET = 10
 
 def clear_execution_state():
     """Clear execution-related session state variables"""
@@ -12,6 +23,66 @@ def clear_execution_state():
     if 'execution_result' in st.session_state:
         del st.session_state.execution_result
 
+def run_submission_tests(code, language, problem_record):
+    """Run the problem examples and the stress test on a submission compiled once."""
+    example_results = None
+    stress_result = None
+    has_reference = problem_record.get('reference') and problem_record.get('generator_code')
+    if not problem_record.get('examples') and not has_reference:
+        return example_results, stress_result
+
+    submission_dir = tempfile.mkdtemp(prefix='submission_')
+    try:
+        with st.spinner("Compiling your code..."):
+            submission = compile_program(code, language, submission_dir)
+        if not submission['success']:
+            st.error(f"Tests skipped, the code does not compile:\n{submission['error']}")
+            return example_results, stress_result
+
+        if problem_record.get('examples'):
+            with st.spinner("Running the problem examples..."):
+                example_results = run_test_cases(
+                    code,
+                    language,
+                    problem_record['examples'],
+                    time_limit(problem_record),
+                    submission_command=submission['command']
+                )
+            if not example_results['success']:
+                st.error(example_results['error'])
+                example_results = None
+            elif example_results['passed'] == example_results['total']:
+                st.success(f"Examples passed: {example_results['passed']}/{example_results['total']}")
+            else:
+                st.error(f"Examples passed: {example_results['passed']}/{example_results['total']}. First failing input:")
+                failed = next(result for result in example_results['results'] if not result['passed'])
+                st.code(failed['input'])
+
+        if has_reference:
+            with st.spinner("Stress testing against a reference solution..."):
+                stress_result = stress_test(
+                    code,
+                    language,
+                    problem_record['reference_code'],
+                    problem_record['generator_code'],
+                    num_cases=STRESS_TEST_CASES,
+                    timeout=time_limit(problem_record),
+                    time_budget=STRESS_TEST_BUDGET,
+                    reference_command=problem_record['reference']['command'],
+                    submission_command=submission['command']
+                )
+            if stress_result['success'] and stress_result['passed']:
+                st.success(f"Stress test passed ({stress_result['cases_run']} random cases)")
+            elif stress_result['success']:
+                st.error("Stress test found a failing input:")
+                st.code(stress_result['counterexample']['input'])
+            else:
+                st.warning(f"Stress test skipped: {stress_result['error']}")
+    finally:
+        shutil.rmtree(submission_dir, ignore_errors=True)
+
+    return example_results, stress_result
+
 def main():
     st.title("AI Coding Interviewer ֎")
     st.markdown("Practice coding interviews with AI-powered feedback!")
@@ -61,18 +132,49 @@ def main():
         if st.button("Generate New Problem"):
             with st.spinner("Creating challenge..."):
                 problem_generator = get_problem_generator()
-                problem_prompt = create_problem_prompt(difficulty, topic)
-                problem_task = Task(
-                    description=problem_prompt,
-                    expected_output="A comprehensive, well-structured coding problem following the specified format",
+                avoid_titles = []
+                with ProblemIndex() as problem_index:
+                    for attempt in range(MAX_REGENERATIONS + 1):
+                        problem_prompt = create_problem_prompt(difficulty, topic, avoid_titles)
+                        problem_task = Task(
+                            description=problem_prompt,
+                            expected_output="A comprehensive, well-structured coding problem following the specified format",
+                            agent=problem_generator
+                        )
+                        crew = Crew(
+                            agents=[problem_generator],
+                            tasks=[problem_task],
+                            verbose=True
+                        )
+                        problem_record = build_problem_record(crew.kickoff())
+                        generated_problem = problem_record['statement']
+
+                        # Reject near-duplicates of earlier problems and ask for something new
+                        duplicate = problem_index.find_similar(generated_problem)
+                        if duplicate is None:
+                            break
+                        avoid_titles.append(duplicate[0])
+                    else:
+                        st.warning(f"This problem is similar to one generated earlier: {duplicate[0]}")
+                    problem_index.add(generated_problem, problem_title(generated_problem))
+
+                # Brute-force reference and input generator for stress testing submissions
+                harness_task = Task(
+                    description=create_stress_harness_prompt(generated_problem),
+                    expected_output="A brute-force Python reference solution and a random input generator",
                     agent=problem_generator
                 )
-                crew = Crew(
+                harness_crew = Crew(
                     agents=[problem_generator],
-                    tasks=[problem_task],
+                    tasks=[harness_task],
                     verbose=True
                 )
-                generated_problem = crew.kickoff()
+                # Compile the reference now so the submit path only has to run it
+                release_record(st.session_state.get('problem_record'))
+                st.session_state.problem_record = attach_reference(
+                    problem_record,
+                    *parse_stress_harness(harness_crew.kickoff())
+                )
                 st.session_state.generated_problem = generated_problem
                 st.session_state.user_code = ""
                 add_history_item("Generated Problem", generated_problem)
@@ -172,6 +274,12 @@ def main():
         with feedback_container:
             cols = st.columns([1, 2])
             with cols[1]:
+                example_results, stress_result = run_submission_tests(
+                    st.session_state.user_code,
+                    language.lower(),
+                    st.session_state.get('problem_record') or {}
+                )
+
                 with st.spinner("Analyzing your code..."):
                     evaluator = get_code_evaluator()
                     explainer = get_solution_explainer()
@@ -179,7 +287,9 @@ def main():
                     evaluation_task = Task(
                         description=create_evaluation_prompt(
                             st.session_state.generated_problem,
-                            st.session_state.user_code
+                            st.session_state.user_code,
+                            stress_result,
+                            example_results
                         ),
                         expected_output="Detailed code evaluation report following the specified format including submitted code score /10 and feedback",
                         agent=evaluator,
@@ -226,4 +226,273 @@ def execute_code(code: str, language: str) -> Dict[str, any]:
         return {
             "success": False,
             "error": f"Error executing code: {str(e)}"
-        } 
\ No newline at end of file
+        } 
+
+def compile_program(code: str, language: str, workdir: str) -> Dict[str, any]:
+    """Compile code once inside workdir and return the command that runs it."""
+    if not code.strip():
+        return {"success": False, "error": "Code cannot be empty"}
+
+    try:
+        if language == "python":
+            try:
+                compile(code, '<string>', 'exec')
+            except SyntaxError as e:
+                return {"success": False, "error": f"Line {e.lineno}: {str(e)}"}
+
+            source_path = os.path.join(workdir, 'main.py')
+            with open(source_path, 'w', encoding='utf-8') as f:
+                f.write(code)
+            return {"success": True, "command": [sys.executable, source_path]}
+
+        elif language == "c++":
+            source_path = os.path.join(workdir, 'main.cpp')
+            exe_path = os.path.join(workdir, 'main' + ('.exe' if sys.platform == 'win32' else ''))
+            with open(source_path, 'w', encoding='utf-8') as f:
+                f.write(code)
+
+            try:
+                compile_process = subprocess.run(
+                    ['g++', '-O2', source_path, '-o', exe_path],
+                    capture_output=True,
+                    text=True,
+                    timeout=10
+                )
+            except FileNotFoundError:
+                return {"success": False, "error": "C++ compiler (g++) not found. Please install g++."}
+            except subprocess.TimeoutExpired:
+                return {"success": False, "error": "Compilation timed out (10 seconds limit)"}
+
+            if compile_process.returncode != 0:
+                return {"success": False, "error": f"Compilation Error:\n{compile_process.stderr}"}
+            return {"success": True, "command": [exe_path]}
+
+        elif language == "java":
+            import re
+            class_match = re.search(r'public\s+class\s+(\w+)', code)
+            if not class_match:
+                return {"success": False, "error": "No public class found. Java code must contain a public class."}
+
+            class_name = class_match.group(1)
+            source_path = os.path.join(workdir, f"{class_name}.java")
+            with open(source_path, 'w', encoding='utf-8') as f:
+                f.write(code)
+
+            try:
+                compile_result = subprocess.run(
+                    ['javac', source_path],
+                    capture_output=True,
+                    text=True
+                )
+            except FileNotFoundError:
+                return {"success": False, "error": "Java compiler (javac) not found. Please install JDK."}
+
+            if compile_result.returncode != 0:
+                return {"success": False, "error": f"Compilation Error:\n{compile_result.stderr}"}
+            return {"success": True, "command": ['java', '-cp', workdir, class_name]}
+
+        return {"success": False, "error": f"Unsupported language: {language}"}
+
+    except Exception as e:
+        return {
+            "success": False,
+            "error": f"Error compiling code: {str(e)}"
+        }
+
+def run_program(command, input_data: str, timeout: float = 5) -> Dict[str, any]:
+    """Run a compiled program on the given stdin and return its output."""
+    try:
+        result = subprocess.run(
+            command,
+            input=input_data,
+            capture_output=True,
+            text=True,
+            timeout=timeout
+        )
+    except subprocess.TimeoutExpired:
+        return {"success": False, "error": f"Program execution timed out ({timeout} seconds limit)"}
+    except Exception as e:
+        return {"success": False, "error": f"Runtime Error: {str(e)}"}
+
+    if result.returncode != 0:
+        return {"success": False, "error": f"Runtime Error (exit code {result.returncode}):\n{result.stderr}"}
+    return {"success": True, "output": result.stdout}
+
+def outputs_match(actual: str, expected: str) -> bool:
+    """Compare program outputs token by token, ignoring whitespace differences."""
+    return actual.split() == expected.split()
+
+# Writes every stress test input as one JSON string per line, generated in a
+# single process so the whole batch runs under one run_program deadline.
+_GENERATOR_DRIVER = """import json, random, sys
+namespace = {}
+exec(compile(open(sys.argv[1], encoding='utf-8').read(), '<generator>', 'exec'), namespace)
+seed, num_cases, max_size = map(int, sys.argv[2:5])
+for i in range(num_cases):
+    sys.stdout.write(json.dumps(str(namespace['generate'](random.Random(seed + i), 1 + i * max_size // num_cases))) + "\\n")
+"""
+
+# Deadline for generating the whole batch of stress test inputs
+GENERATOR_TIMEOUT = 10
+
+def _generate_stress_inputs(generator_path, seed, num_cases, max_size):
+    """Run the input generator once and return the list of generated inputs."""
+    import json
+
+    generated = run_program(
+        [sys.executable, '-c', _GENERATOR_DRIVER, generator_path, str(seed), str(num_cases), str(max_size)],
+        "",
+        GENERATOR_TIMEOUT
+    )
+    if not generated['success']:
+        return {"success": False, "error": f"Input generator failed:\n{generated['error']}"}
+
+    inputs = [json.loads(line) for line in generated['output'].splitlines() if line.strip()]
+    if len(inputs) != num_cases:
+        return {"success": False, "error": f"Input generator produced {len(inputs)} of {num_cases} inputs"}
+    return {"success": True, "inputs": [data if data.endswith('\n') else data + '\n' for data in inputs]}
+
+def _run_stress_case(case):
+    """Run one generated input through the submission and the reference."""
+    input_data, submission_command, reference_command, timeout = case
+
+    expected = run_program(reference_command, input_data, timeout)
+    if not expected['success']:
+        return {"status": "error", "input": input_data, "error": f"Reference solution failed:\n{expected['error']}"}
+
+    actual = run_program(submission_command, input_data, timeout)
+    if actual['success'] and outputs_match(actual['output'], expected['output']):
+        return {"status": "ok"}
+    return {
+        "status": "mismatch",
+        "input": input_data,
+        "expected": expected['output'],
+        "actual": actual['output'] if actual['success'] else actual['error']
+    }
+
+def run_test_cases(code: str, language: str, test_cases, timeout: float = 5,
+                   submission_command=None) -> Dict[str, any]:
+    """Compile code once and run it on each {"input", "output"} test case.
+
+    Pass submission_command to reuse a submission already compiled with compile_program.
+    """
+    workdir = tempfile.mkdtemp(prefix='tests_')
+    try:
+        if submission_command is None:
+            program = compile_program(code, language, workdir)
+            if not program['success']:
+                return program
+            submission_command = program['command']
+
+        results = []
+        for case in test_cases:
+            input_data = case['input'] if case['input'].endswith('\n') else case['input'] + '\n'
+            run = run_program(submission_command, input_data, timeout)
+            actual = run['output'] if run['success'] else run['error']
+            results.append({
+                "input": case['input'],
+                "expected": case['output'],
+                "actual": actual,
+                "passed": run['success'] and outputs_match(actual, case['output'])
+            })
+        return {
+            "success": True,
+            "passed": sum(result['passed'] for result in results),
+            "total": len(results),
+            "results": results
+        }
+    finally:
+        import shutil
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def stress_test(code: str, language: str, reference_code: str, generator_code: str,
+                num_cases: int = 1000, max_size: int = 10, seed: int = 0,
+                max_workers: int = None, timeout: float = 5, time_budget: float = None,
+                reference_command=None, submission_command=None) -> Dict[str, any]:
+    """Differentially test a submission against a brute-force reference on random inputs.
+
+    Cases are ordered by increasing input size and run on a thread pool (each
+    case is two subprocesses, so threads only wait on them); the run stops at
+    the first mismatch, so the reported counterexample is the smallest failing
+    input found. time_budget caps the wall-clock seconds spent on cases, and
+    cases_run in the result says how many were actually checked. Pass
+    reference_command and submission_command to reuse programs already
+    compiled with compile_program.
+    """
+    import time
+
+    if not (reference_command or reference_code.strip()) or not generator_code.strip():
+        return {"success": False, "error": "Stress testing needs a reference solution and an input generator"}
+
+    start = time.time()
+    workdir = tempfile.mkdtemp(prefix='stress_')
+    try:
+        if submission_command is None:
+            submission_dir = os.path.join(workdir, 'submission')
+            os.mkdir(submission_dir)
+            submission = compile_program(code, language, submission_dir)
+            if not submission['success']:
+                return submission
+            submission_command = submission['command']
+
+        if reference_command is None:
+            reference_dir = os.path.join(workdir, 'reference')
+            os.mkdir(reference_dir)
+            reference = compile_program(reference_code, "python", reference_dir)
+            if not reference['success']:
+                return {"success": False, "error": f"Reference solution failed to compile:\n{reference['error']}"}
+            reference_command = reference['command']
+
+        try:
+            compile(generator_code, '<generator>', 'exec')
+        except SyntaxError as e:
+            return {"success": False, "error": f"Input generator failed to compile:\nLine {e.lineno}: {str(e)}"}
+        generator_path = os.path.join(workdir, 'generator.py')
+        with open(generator_path, 'w', encoding='utf-8') as f:
+            f.write(generator_code)
+
+        generated = _generate_stress_inputs(generator_path, seed, num_cases, max_size)
+        if not generated['success']:
+            return generated
+        cases = [(input_data, submission_command, reference_command, timeout) for input_data in generated['inputs']]
+
+        max_workers = max_workers or os.cpu_count() or 1
+        if max_workers == 1:
+            results = map(_run_stress_case, cases)
+            executor = None
+        else:
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+            results = executor.map(_run_stress_case, cases)
+
+        cases_run = 0
+        try:
+            # map yields in submission order, so the first failure seen is also the smallest one
+            for cases_run, outcome in enumerate(results, start=1):
+                if outcome['status'] == "error":
+                    return {"success": False, "error": outcome['error']}
+                if outcome['status'] == "mismatch":
+                    return {
+                        "success": True,
+                        "passed": False,
+                        "cases_run": cases_run,
+                        "counterexample": {
+                            "input": outcome['input'],
+                            "expected": outcome['expected'],
+                            "actual": outcome['actual']
+                        }
+                    }
+                if time_budget is not None and time.time() - start >= time_budget:
+                    break
+            return {"success": True, "passed": True, "cases_run": cases_run}
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+    except Exception as e:
+        return {
+            "success": False,
+            "error": f"Error running stress test: {str(e)}"
+        }
+    finally:
+        import shutil
+        shutil.rmtree(workdir, ignore_errors=True)
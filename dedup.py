@@ -0,0 +1,125 @@
+# dedup.py
+# Near-duplicate detection for generated problems using MinHash signatures and
+# locality-sensitive hashing (LSH). The index lives in a local SQLite file, so
+# lookups are a handful of indexed queries and memory stays bounded no matter
+# how many problems have been stored.
+import hashlib
+import os
+import random
+import re
+import sqlite3
+from array import array
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "problem_index.db")
+
+NUM_PERM = 128
+BANDS = 32  # 32 bands of 4 rows: pairs above ~0.5 similarity almost always share a bucket
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_rng = random.Random(1)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+def _hash(data: bytes, size: int = 4) -> int:
+    return int.from_bytes(hashlib.blake2b(data, digest_size=size).digest(), 'little')
+
+def shingles(text):
+    """Return the set of word shingles of the normalized problem text."""
+    words = re.findall(r'[a-z0-9]+', str(text).lower())
+    if len(words) < SHINGLE_SIZE:
+        return {" ".join(words)}
+    return {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+def minhash(text):
+    """Compute the MinHash signature of a problem's text."""
+    hashes = [_hash(shingle.encode('utf-8')) for shingle in shingles(text)]
+    return array('I', (
+        min((a * h + b) % _PRIME & _MAX_HASH for h in hashes)
+        for a, b in _PERMUTATIONS
+    ))
+
+def similarity(signature, other):
+    """Estimate the Jaccard similarity of two problems from their signatures."""
+    return sum(x == y for x, y in zip(signature, other)) / NUM_PERM
+
+def _band_hashes(signature):
+    for band in range(BANDS):
+        rows = signature[band * ROWS:(band + 1) * ROWS]
+        # Signed so the value fits SQLite's 64-bit INTEGER
+        yield band, _hash(rows.tobytes(), 8) - (1 << 63)
+
+class ProblemIndex:
+    """Persistent MinHash/LSH index over every problem generated so far."""
+
+    def __init__(self, path=DEFAULT_INDEX_PATH, threshold=0.5):
+        self.threshold = threshold
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA cache_size = -16000")  # cap the page cache at ~16 MB
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS problems ("
+            "id INTEGER PRIMARY KEY, title TEXT, signature BLOB NOT NULL)"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS buckets ("
+            "band INTEGER, hash INTEGER, problem_id INTEGER, "
+            "PRIMARY KEY (band, hash, problem_id)) WITHOUT ROWID"
+        )
+        self.conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM problems").fetchone()[0]
+
+    def find_similar(self, text):
+        """Return (title, similarity) of the closest stored near-duplicate, or None."""
+        signature = minhash(text)
+        candidates = set()
+        for band, band_hash in _band_hashes(signature):
+            candidates.update(row[0] for row in self.conn.execute(
+                "SELECT problem_id FROM buckets WHERE band = ? AND hash = ?",
+                (band, band_hash)
+            ))
+
+        best = None
+        for problem_id in candidates:
+            title, stored = self.conn.execute(
+                "SELECT title, signature FROM problems WHERE id = ?", (problem_id,)
+            ).fetchone()
+            score = similarity(signature, array('I', stored))
+            if score >= self.threshold and (best is None or score > best[1]):
+                best = (title, score)
+        return best
+
+    def add(self, text, title=""):
+        """Store a problem in the index and return its id."""
+        signature = minhash(text)
+        with self.conn:
+            problem_id = self.conn.execute(
+                "INSERT INTO problems (title, signature) VALUES (?, ?)",
+                (title, signature.tobytes())
+            ).lastrowid
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO buckets (band, hash, problem_id) VALUES (?, ?, ?)",
+                ((band, band_hash, problem_id) for band, band_hash in _band_hashes(signature))
+            )
+        return problem_id
+
+def problem_title(problem):
+    """Return the first non-empty line of a problem, stripped of markdown heading marks
+    and of a leading "Problem Title:" label."""
+    for line in str(problem).splitlines():
+        line = line.strip().strip('#*').strip()
+        line = re.sub(r"^problem title\b\s*:?[*\s]*", "", line, flags=re.IGNORECASE).strip('#*').strip()
+        if line:
+            return line
+    return ""
@@ -0,0 +1,347 @@
+# grade.py
+# Headless batch grading of a directory of submissions against one problem.
+#
+#   python grade.py problem.md submissions/ --reference ref.py --generator gen.py -o results.csv
+#
+# Results are appended to the output file as each submission finishes, so an
+# interrupted run picks up where it left off when started again with the same output.
+import argparse
+import csv
+import json
+import os
+import sys
+import tempfile
+import time
+import shutil
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+from code_runner import compile_program, run_test_cases, stress_test
+from problem_record import build_problem_record, attach_reference, release_record, time_limit
+from tasks import create_stress_harness_prompt, parse_stress_harness, create_evaluation_prompt
+
+LANGUAGES = {
+    ".py": "python",
+    ".cpp": "c++",
+    ".cc": "c++",
+    ".cxx": "c++",
+    ".java": "java"
+}
+
+# Compilers and runtimes each language needs; a missing one is an environment
+# problem, not a property of the submission
+TOOLCHAINS = {
+    "python": [],
+    "c++": ["g++"],
+    "java": ["javac", "java"]
+}
+
+RESULT_FIELDS = ["submission", "language", "status", "examples_passed", "examples_total",
+                 "stress_cases_run", "error", "evaluation", "seconds"]
+
+def find_submissions(directory):
+    """Return the sorted submission file names in directory with a supported extension."""
+    return sorted(
+        name for name in os.listdir(directory)
+        if os.path.isfile(os.path.join(directory, name))
+        and os.path.splitext(name)[1].lower() in LANGUAGES
+    )
+
+def load_completed(output_path):
+    """Return the names of submissions already recorded in the output file."""
+    if not os.path.exists(output_path):
+        return set()
+
+    with open(output_path, encoding='utf-8', newline='') as f:
+        if output_path.endswith('.jsonl'):
+            completed = set()
+            for line in f:
+                try:
+                    completed.add(json.loads(line)['submission'])
+                except (ValueError, KeyError):
+                    # A line cut short by an interruption; that submission is graded again
+                    continue
+            return completed
+        return {row['submission'] for row in csv.DictReader(f) if row.get('submission')}
+
+class ResultWriter:
+    """Append result rows to a CSV or JSONL file, flushing after every row."""
+
+    def __init__(self, output_path):
+        self.jsonl = output_path.endswith('.jsonl')
+        write_header = not os.path.exists(output_path) or os.path.getsize(output_path) == 0
+        self.file = open(output_path, 'a', encoding='utf-8', newline='')
+        if not self.jsonl:
+            self.writer = csv.DictWriter(self.file, fieldnames=RESULT_FIELDS)
+            if write_header:
+                self.writer.writeheader()
+
+    def write(self, row):
+        if self.jsonl:
+            self.file.write(json.dumps(row) + "\n")
+        else:
+            self.writer.writerow(row)
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+def new_row(name):
+    """Return an empty result row for a submission file name."""
+    return {"submission": name, "language": LANGUAGES[os.path.splitext(name)[1].lower()],
+            "status": "", "examples_passed": 0, "examples_total": 0, "stress_cases_run": 0,
+            "error": "", "evaluation": "", "seconds": 0}
+
+class InfrastructureError(Exception):
+    """Grading could not run for reasons unrelated to the submission."""
+
+def grade_submission(path, problem_record, num_cases, timeout):
+    """Compile and test one submission; runs inside a worker process."""
+    start = time.time()
+    row = new_row(os.path.basename(path))
+    language = row['language']
+
+    missing = [tool for tool in TOOLCHAINS[language] if shutil.which(tool) is None]
+    if missing:
+        raise InfrastructureError(f"{', '.join(missing)} not found on this machine")
+
+    try:
+        with open(path, encoding='utf-8') as f:
+            code = f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        row.update(status="error", error=f"Could not read submission: {str(e)}")
+        return row, "", None, None
+
+    example_results = None
+    stress_result = None
+    has_reference = bool(problem_record['reference'] and problem_record['generator_code'])
+    workdir = tempfile.mkdtemp(prefix='grade_')
+    try:
+        # Compiled once and shared by the example run and the stress test
+        program = compile_program(code, language, workdir)
+        if not program['success']:
+            row.update(status="compile_error", error=program['error'])
+        elif not problem_record['examples'] and not has_reference:
+            # Without examples or a reference there is no input to run
+            row.update(status="compiled")
+
+        if program['success'] and problem_record['examples']:
+            example_results = run_test_cases(code, language, problem_record['examples'], timeout,
+                                             submission_command=program['command'])
+            row.update(status="passed", examples_passed=example_results['passed'],
+                       examples_total=example_results['total'])
+            failed = [result for result in example_results['results'] if not result['passed']]
+            if failed:
+                row.update(status="failed", error=f"Failing example input:\n{failed[0]['input']}")
+
+        if program['success'] and has_reference and row['status'] in ("", "passed"):
+            # Parallelism is across submissions, so each stress test runs in-process
+            result = stress_test(code, language, problem_record['reference_code'], problem_record['generator_code'],
+                                 num_cases=num_cases, max_workers=1, timeout=timeout,
+                                 reference_command=problem_record['reference']['command'],
+                                 submission_command=program['command'])
+            if not result['success']:
+                row.update(status="error", error=result['error'])
+            elif result['passed']:
+                row.update(status="passed", stress_cases_run=result['cases_run'])
+                stress_result = result
+            else:
+                row.update(status="failed", stress_cases_run=result['cases_run'],
+                           error=f"Counterexample input:\n{result['counterexample']['input']}")
+                stress_result = result
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    row['seconds'] = round(time.time() - start, 3)
+    return row, code, stress_result, example_results
+
+def evaluate_submission(problem, code, stress_result, example_results):
+    """Run the code evaluator agent on one submission."""
+    from crewai import Task, Crew
+    from agents import get_code_evaluator
+
+    evaluator = get_code_evaluator()
+    evaluation_task = Task(
+        description=create_evaluation_prompt(problem, code, stress_result, example_results),
+        expected_output="Detailed code evaluation report following the specified format including submitted code score /10 and feedback",
+        agent=evaluator
+    )
+    crew = Crew(agents=[evaluator], tasks=[evaluation_task], verbose=False)
+    return str(crew.kickoff())
+
+def generate_stress_harness(problem):
+    """Ask the problem generator for a reference solution and input generator."""
+    from crewai import Task, Crew
+    from agents import get_problem_generator
+
+    problem_generator = get_problem_generator()
+    harness_task = Task(
+        description=create_stress_harness_prompt(problem),
+        expected_output="A brute-force Python reference solution and a random input generator",
+        agent=problem_generator
+    )
+    crew = Crew(agents=[problem_generator], tasks=[harness_task], verbose=False)
+    return parse_stress_harness(crew.kickoff())
+
+def read_file(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Grade a directory of Python/C++/Java submissions against one problem.")
+    parser.add_argument("problem", help="Problem statement file")
+    parser.add_argument("submissions", help="Directory of submission files (.py, .cpp, .java)")
+    parser.add_argument("-o", "--output", default="results.csv", help="Results file, .csv or .jsonl (default: results.csv)")
+    parser.add_argument("--reference", help="Brute-force Python reference solution for stress testing")
+    parser.add_argument("--generator", help="Python file defining generate(rng, n) for stress testing")
+    parser.add_argument("--generate-harness", action="store_true",
+                        help="Ask the problem generator for the reference and input generator")
+    parser.add_argument("--cases", type=int, default=200, help="Random stress test cases per submission (default: 200)")
+    parser.add_argument("--timeout", type=float,
+                        help="Per-run time limit in seconds (default: the problem's time limit, at least 5)")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="Submissions graded in parallel (default: CPU count)")
+    parser.add_argument("--evaluate", action="store_true", help="Also run the code evaluator agent on each submission")
+    parser.add_argument("--eval-concurrency", type=int, default=2,
+                        help="Maximum evaluator agent calls in flight (default: 2)")
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.eval_concurrency < 1:
+        parser.error("--eval-concurrency must be at least 1")
+    if not args.output.endswith(('.csv', '.jsonl')):
+        parser.error("--output must end with .csv or .jsonl")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    problem_record = build_problem_record(read_file(args.problem))
+    problem = problem_record['statement']
+
+    reference_code = read_file(args.reference) if args.reference else ""
+    generator_code = read_file(args.generator) if args.generator else ""
+    if args.generate_harness and not (reference_code and generator_code):
+        print("Generating stress test harness...", file=sys.stderr)
+        reference_code, generator_code = generate_stress_harness(problem)
+        if not (reference_code and generator_code):
+            print("Could not parse a stress test harness; only running the problem examples.", file=sys.stderr)
+    # Compile the reference once up front instead of once per submission
+    attach_reference(problem_record, reference_code, generator_code)
+    if reference_code and not problem_record['reference']:
+        print("The reference solution does not compile; skipping stress tests.", file=sys.stderr)
+    timeout = args.timeout or time_limit(problem_record)
+
+    completed = load_completed(args.output)
+    pending_names = [name for name in find_submissions(args.submissions) if name not in completed]
+    total = len(pending_names)
+    if completed:
+        print(f"Resuming: {len(completed)} submissions already graded in {args.output}", file=sys.stderr)
+    if not total:
+        print("Nothing to grade.", file=sys.stderr)
+        release_record(problem_record)
+        return 0
+
+    writer = ResultWriter(args.output)
+    grading_pool = ProcessPoolExecutor(max_workers=args.workers)
+    evaluation_pool = ThreadPoolExecutor(max_workers=args.eval_concurrency) if args.evaluate else None
+    start = time.time()
+    finished = 0
+    skipped = []
+    # Grading attempts lost to a crashed worker pool, per submission
+    crashes = {}
+
+    def record(row):
+        nonlocal finished
+        writer.write(row)
+        finished += 1
+        rate = finished / max(time.time() - start, 1e-9) * 60
+        print(f"[{finished}/{total}] {row['submission']}: {row['status']} ({rate:.1f} submissions/min)", file=sys.stderr)
+
+    def skip(name, reason):
+        # No row is written, so the next run with the same output grades it again
+        skipped.append(name)
+        print(f"[skipped] {name}: {reason}", file=sys.stderr)
+
+    def submit_grading(name):
+        path = os.path.join(args.submissions, name)
+        if crashes.get(name, 0) >= 2:
+            # Crashed the shared pool twice: grade it alone so a crash can only be its own
+            pool = ProcessPoolExecutor(max_workers=1)
+            future = pool.submit(grade_submission, path, problem_record, args.cases, timeout)
+            pending[future] = ("isolated", name, pool)
+        else:
+            future = grading_pool.submit(grade_submission, path, problem_record, args.cases, timeout)
+            pending[future] = ("grade", name, grading_pool)
+
+    pending = {}
+    try:
+        for name in pending_names:
+            submit_grading(name)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                kind, name, payload = pending.pop(future)
+                if kind == "evaluate":
+                    # An evaluation finished for a row that was already graded
+                    row = payload
+                    try:
+                        row['evaluation'] = future.result()
+                    except Exception as e:
+                        row['evaluation'] = f"Evaluation failed: {str(e)}"
+                    record(row)
+                    continue
+
+                if kind == "isolated":
+                    payload.shutdown(wait=False)
+                try:
+                    row, code, stress_result, example_results = future.result()
+                except BrokenProcessPool:
+                    if kind == "isolated":
+                        # Only this submission was running, so the crash is its own
+                        row = new_row(name)
+                        row.update(status="error", error="The submission crashed the grading worker")
+                        record(row)
+                        continue
+                    if payload is grading_pool:
+                        # Every in-flight future of a broken pool fails; rebuild it once
+                        grading_pool.shutdown(wait=False, cancel_futures=True)
+                        grading_pool = ProcessPoolExecutor(max_workers=args.workers)
+                    crashes[name] = crashes.get(name, 0) + 1
+                    submit_grading(name)
+                    continue
+                except Exception as e:
+                    skip(name, f"Grading failed: {type(e).__name__}: {str(e)}")
+                    continue
+
+                if evaluation_pool is not None and row['status'] not in ("error", "compile_error"):
+                    pending[evaluation_pool.submit(evaluate_submission, problem, code,
+                                                   stress_result, example_results)] = ("evaluate", name, row)
+                else:
+                    record(row)
+    except KeyboardInterrupt:
+        print("\nInterrupted; rerun with the same output file to resume.", file=sys.stderr)
+        grading_pool.shutdown(wait=False, cancel_futures=True)
+        for kind, name, payload in pending.values():
+            if kind == "isolated":
+                payload.shutdown(wait=False, cancel_futures=True)
+        if evaluation_pool is not None:
+            evaluation_pool.shutdown(wait=False, cancel_futures=True)
+        return 130
+    finally:
+        writer.close()
+        release_record(problem_record)
+
+    grading_pool.shutdown()
+    if evaluation_pool is not None:
+        evaluation_pool.shutdown()
+
+    elapsed = time.time() - start
+    print(f"Graded {finished} submissions in {elapsed:.1f}s ({finished / max(elapsed, 1e-9) * 60:.1f} submissions/min)",
+          file=sys.stderr)
+    if skipped:
+        print(f"{len(skipped)} submissions were skipped because of grading errors; "
+              f"rerun with the same output file to retry them.", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
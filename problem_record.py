@@ -0,0 +1,142 @@
+# problem_record.py
+# Machine-readable record of a generated problem: the statement shown to the
+# user, the example I/O pairs, the constraints and an optional reference
+# solution compiled ahead of time, so judging needs no extra generation work.
+import json
+import re
+import shutil
+import tempfile
+from code_runner import compile_program
+
+_JSON_BLOCK = re.compile(r"```json\s*\n(.*?)```", re.DOTALL)
+_SUMMARY_HEADING = re.compile(r"^[#*\s]*Machine-Readable Summary[*\s]*$", re.MULTILINE | re.IGNORECASE)
+# The output ends at an Explanation, the next Example or the next section heading
+_EXAMPLE = re.compile(
+    r"Input:?\**\s*(.*?)\s*\**Output:?\**\s*(.*?)\s*"
+    r"(?=\**Explanation|\**Example|^[ \t]*#|^[ \t]*\*\*"
+    r"|^[ \t]*(?:Notes|Constraints|Input Format|Output Format|Follow[- ]?up)\b|\Z)",
+    re.DOTALL | re.IGNORECASE | re.MULTILINE
+)
+
+def parse_number(text):
+    """Parse numbers written as 100000, 100,000, 1e5, 10^5 or 10**5."""
+    text = str(text).strip().replace(",", "")
+    power = re.fullmatch(r"(-?\d+)\s*(?:\^|\*\*)\s*(\d+)", text)
+    if power:
+        return int(power.group(1)) ** int(power.group(2))
+    try:
+        value = float(text)
+    except ValueError:
+        return None
+    return int(value) if value.is_integer() else value
+
+def _clean_example(text):
+    text = text.strip()
+    fence = re.fullmatch(r"```\w*[^\n]*\n(.*?)\n?```", text, re.DOTALL)
+    if fence:
+        return fence.group(1).strip()
+    # Inline values: drop `code` marks and decode a literal \n written on one line
+    text = text.replace('`', '').strip()
+    if '\n' not in text:
+        text = text.replace('\\n', '\n')
+    return text
+
+def parse_examples(statement):
+    """Fall back to scraping Input/Output pairs from the Example sections of the statement."""
+    examples = []
+    for section in re.split(r"\**Example\s*\d+\**", statement)[1:]:
+        match = _EXAMPLE.search(section)
+        if match:
+            examples.append({
+                "input": _clean_example(match.group(1)),
+                "output": _clean_example(match.group(2))
+            })
+    return examples
+
+def parse_constraints(statement):
+    """Fall back to scraping the input size limit and time limit from the statement."""
+    constraints = {}
+    number = r"(-?\d[\d,]*(?:\s*(?:\^|\*\*)\s*\d+|e\d+)?)"
+    size = re.search(r"\b[nN]\s*(?:<=|≤|<)\s*" + number, statement)
+    if size:
+        constraints["max_n"] = parse_number(size.group(1))
+    values = re.search(number + r"\s*(?:<=|≤)\s*\w+\[i\]\s*(?:<=|≤)\s*" + number, statement)
+    if values:
+        constraints["min_value"] = parse_number(values.group(1))
+        constraints["max_value"] = parse_number(values.group(2))
+    time_limit = re.search(r"time limit\D{0,20}(\d+(?:\.\d+)?)\s*(?:seconds?|sec|s)\b", statement, re.IGNORECASE)
+    if time_limit:
+        constraints["time_limit_seconds"] = parse_number(time_limit.group(1))
+    return constraints
+
+def build_problem_record(problem):
+    """Split the generator's response into the displayed statement and its structured data."""
+    problem = str(problem)
+    statement = problem
+    summary = {}
+    blocks = list(_JSON_BLOCK.finditer(problem))
+    if blocks:
+        block = blocks[-1]
+        try:
+            data = json.loads(block.group(1))
+        except ValueError:
+            data = None
+
+        # A heading counts only if no other code block sits between it and the JSON
+        headings = list(_SUMMARY_HEADING.finditer(problem, 0, block.start()))
+        heading = headings[-1] if headings and "```" not in problem[headings[-1].end():block.start()] else None
+        trailing = not problem[block.end():].strip()
+
+        # JSON elsewhere in the statement (e.g. an input format example) is left alone
+        if isinstance(data, dict) and ((heading and trailing) or "examples" in data or "constraints" in data):
+            summary = data
+            start = heading.start() if heading else block.start()
+            statement = (problem[:start].rstrip() + "\n\n" + problem[block.end():].lstrip()).strip()
+
+    examples = [
+        {"input": str(example.get("input", "")), "output": str(example.get("output", ""))}
+        for example in summary.get("examples", []) if isinstance(example, dict)
+    ] or parse_examples(statement)
+
+    constraints = summary.get("constraints")
+    if not isinstance(constraints, dict) or not constraints:
+        constraints = parse_constraints(statement)
+
+    return {
+        "statement": statement,
+        "examples": examples,
+        "constraints": constraints,
+        "reference_code": "",
+        "generator_code": "",
+        "reference": None
+    }
+
+def attach_reference(record, reference_code, generator_code):
+    """Compile the reference solution ahead of time and keep its run command in the record."""
+    record["reference_code"] = reference_code
+    record["generator_code"] = generator_code
+    if not reference_code:
+        return record
+
+    workdir = tempfile.mkdtemp(prefix='reference_')
+    compiled = compile_program(reference_code, "python", workdir)
+    if compiled['success']:
+        record["reference"] = {"command": compiled['command'], "workdir": workdir}
+    else:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return record
+
+def release_record(record):
+    """Remove the compiled reference artifacts of a record that is no longer in use."""
+    if record and record.get("reference"):
+        shutil.rmtree(record["reference"]["workdir"], ignore_errors=True)
+        record["reference"] = None
+
+def time_limit(record, default=5):
+    """Return the per-run timeout in seconds for a problem.
+
+    The timeout covers the whole process, including interpreter or JVM startup,
+    so the problem's own time limit is only used when it is above the default.
+    """
+    limit = (record or {}).get("constraints", {}).get("time_limit_seconds")
+    return max(limit, default) if isinstance(limit, (int, float)) and limit > 0 else default
@@ -1,5 +1,11 @@
 # tasks.py
-def create_problem_prompt(difficulty, topic):
+def create_problem_prompt(difficulty, topic, avoid_titles=None):
+    avoid_section = ""
+    if avoid_titles:
+        avoid_list = "\n".join(f"- {title}" for title in avoid_titles)
+        avoid_section = f"""
+6. Must be substantially different from these previously generated problems (different task, not just a new story):
+{avoid_list}"""
     return f"""Create a {difficulty.lower()} level coding problem about {topic} following this structured format:
 
 Problem Title
@@ -44,14 +50,110 @@ Notes
 - Relevant algorithmic concepts or data structures to consider
 - Follow-up questions for additional challenge
 
+Machine-Readable Summary
+End the response with a ```json code block (and nothing after it) of this form:
+{{"examples": [{{"input": "<exact stdin of the example>", "output": "<exact expected stdout>"}}], "constraints": {{"max_n": 100000, "min_value": -1000000000, "max_value": 1000000000, "time_limit_seconds": 2}}}}
+- Include every example above, written exactly as a program would read and print it
+- Use the actual limits of this problem for the constraint values
+
 Requirements:
 1. Should test both theoretical understanding and practical coding skills
 2. Must have clear edge cases and corner cases
 3. Must be unambiguous and well-specified
 4. Should match the requested difficulty level: {difficulty}
-5. Should focus on the requested topic: {topic}"""
+5. Should focus on the requested topic: {topic}{avoid_section}"""
+
+def create_stress_harness_prompt(problem):
+    return f"""For the following coding problem, write a stress-testing harness in Python:
+
+[Problem]
+{problem}
 
-def create_evaluation_prompt(problem, code):
+Provide exactly two Python code blocks, each under its own heading:
+
+Reference Solution
+- A brute-force solution that is obviously correct, even if it is slow
+- Reads the input from stdin in the exact Input Format of the problem
+- Prints the answer to stdout in the exact Output Format of the problem
+
+Input Generator
+- Defines a function `generate(rng, n)` that returns one valid input as a string
+- `rng` is a `random.Random` instance; use it for all randomness
+- `n` is a small size hint (1 to 10); keep inputs tiny so the brute force stays fast
+- Every generated input must satisfy all constraints of the problem
+
+Do not include anything other than the two headings and their code blocks."""
+
+def parse_stress_harness(harness):
+    """Extract the reference solution and input generator code from the harness response."""
+    import re
+    harness = str(harness)
+    blocks = {}
+    for heading in ("Reference Solution", "Input Generator"):
+        # The heading must be a line of its own, not a mention in the prose
+        heading_match = re.search(
+            r"^[#*\s]*(?:\d+[.)]\s*)?" + heading + r"[*:\s]*$",
+            harness,
+            re.MULTILINE | re.IGNORECASE
+        )
+        code_match = heading_match and re.compile(r"```\w*[^\n]*\n(.*?)```", re.DOTALL).search(
+            harness, heading_match.end()
+        )
+        blocks[heading] = code_match.group(1) if code_match else ""
+    return blocks["Reference Solution"], blocks["Input Generator"]
+
+def format_counterexample(stress_result):
+    if not stress_result or not stress_result.get('success'):
+        return ""
+    if stress_result['passed']:
+        return f"The submission matched the brute-force reference on all {stress_result['cases_run']} random stress test cases."
+
+    counterexample = stress_result['counterexample']
+    return f"""The submission disagreed with a brute-force reference solution on random stress test case #{stress_result['cases_run']}.
+This is the smallest failing input found:
+
+Input:
+{counterexample['input']}
+Expected Output:
+{counterexample['expected']}
+Actual Output:
+{counterexample['actual']}"""
+
+def format_example_results(example_results):
+    if not example_results or not example_results.get('success'):
+        return ""
+
+    lines = [f"The submission passed {example_results['passed']} of {example_results['total']} problem examples."]
+    for idx, result in enumerate(example_results['results'], start=1):
+        if not result['passed']:
+            lines.append(f"""
+Example {idx} failed
+Input:
+{result['input']}
+Expected Output:
+{result['expected']}
+Actual Output:
+{result['actual']}""")
+    return "\n".join(lines)
+
+def create_evaluation_prompt(problem, code, stress_result=None, example_results=None):
+    evidence_section = ""
+    examples_text = format_example_results(example_results)
+    if examples_text:
+        evidence_section += f"""
+[Example Test Results]
+{examples_text}
+"""
+    stress_text = format_counterexample(stress_result)
+    if stress_text:
+        evidence_section += f"""
+[Stress Test Result]
+{stress_text}
+"""
+    if evidence_section:
+        evidence_section += """
+Treat these test results as concrete evidence when judging correctness; for any failing input, explain which logical error in the code produces it.
+"""
     return f"""Evaluate the following code submission comprehensively:
 
 [Problem]
@@ -59,7 +161,7 @@ def create_evaluation_prompt(problem, code):
 
 [Submitted Code]
 {code}
-
+{evidence_section}
 Provide a detailed evaluation following this structure:
 
 Correctness Analysis